@@ -1,8 +1,11 @@
 from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import PlainTextResponse
 from typing import List, Optional
 
+from ..core.instrumentation import InstrumentedRoute, render_metrics
 from ..services.data_loader import get_dataset_manager
 from ..services.analytics import (
+    AnalyticsContext,
     compute_summary_statistics,
     compute_trends,
     compute_groupby_analytics,
@@ -16,11 +19,17 @@ from ..models.responses import (
     AnomalyResponse,
     ClusterSummaryResponse,
     QualityResponse,
+    BatchResponse,
+    ForecastResponse,
+    IngestResponse,
 )
+from ..models.requests import BatchRequest, IngestRequest
 from ..services.ml import compute_kmeans_clusters
 from ..services.analytics import compute_quality_overview
+from ..services.batch import run_batch
+from ..services.forecast import compute_forecast, get_forecast_cache
 
-api_router = APIRouter()
+api_router = APIRouter(route_class=InstrumentedRoute)
 
 
 @api_router.get("/schema", response_model=SchemaResponse)
@@ -60,14 +69,19 @@ def get_trends(
     manager = get_dataset_manager()
     df = manager.get_dataframe(dataset)
     schema = manager.get_schema(dataset)
-    result = compute_trends(
-        df,
-        schema,
-        date_field=date_field,
-        metric=metric,
-        freq=freq,
-        group_by=group_by,
-    )
+    context = AnalyticsContext(df, schema, period_keys=manager.get_period_keys(dataset, df))
+    try:
+        result = compute_trends(
+            df,
+            schema,
+            date_field=date_field,
+            metric=metric,
+            freq=freq,
+            group_by=group_by,
+            context=context,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
     return TrendsResponse(dataset=dataset, result=result)
 
 
@@ -132,3 +146,77 @@ def get_quality(
     schema = manager.get_schema(dataset)
     result = compute_quality_overview(df, schema)
     return QualityResponse(dataset=dataset, result=result)
+
+
+@api_router.post("/batch", response_model=BatchResponse)
+def post_batch(request: BatchRequest) -> BatchResponse:
+    manager = get_dataset_manager()
+    df = manager.get_dataframe(request.dataset)
+    schema = manager.get_schema(request.dataset)
+    period_keys = manager.get_period_keys(request.dataset, df)
+    queries = [query.model_dump() for query in request.queries]
+    try:
+        results = run_batch(df, schema, queries, period_keys=period_keys)
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+    return BatchResponse(dataset=request.dataset, results=results)
+
+
+@api_router.get("/forecast", response_model=ForecastResponse)
+def get_forecast(
+    dataset: str = Query(...),
+    date_field: Optional[str] = Query(None),
+    metric: Optional[str] = Query(None),
+    freq: str = Query("M"),
+    group_by: Optional[str] = Query(None),
+    horizon: int = Query(6, ge=1, le=365),
+    model: str = Query("holt"),
+    alpha: float = Query(0.5, gt=0, le=1),
+    beta: float = Query(0.1, ge=0, le=1),
+) -> ForecastResponse:
+    manager = get_dataset_manager()
+    df, period_keys, version = manager.snapshot(dataset)
+    schema = manager.get_schema(dataset)
+    context = AnalyticsContext(df, schema, period_keys=period_keys)
+    try:
+        result = compute_forecast(
+            df,
+            schema,
+            date_field=date_field,
+            metric=metric,
+            freq=freq,
+            group_by=group_by,
+            horizon=horizon,
+            model=model,
+            alpha=alpha,
+            beta=beta,
+            context=context,
+            cache=get_forecast_cache(),
+            dataset=dataset,
+            version=version,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+    return ForecastResponse(dataset=dataset, result=result)
+
+
+@api_router.post("/datasets/{dataset}/rows", response_model=IngestResponse)
+def post_dataset_rows(dataset: str, request: IngestRequest) -> IngestResponse:
+    manager = get_dataset_manager()
+    if dataset not in manager.list_datasets():
+        raise HTTPException(status_code=404, detail="Dataset not found")
+    try:
+        metadata = manager.append_rows(dataset, request.rows)
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+    except RuntimeError as exc:
+        raise HTTPException(status_code=409, detail=str(exc))
+    return IngestResponse(dataset=dataset, version=metadata["version"], rows=metadata["rows"])
+
+
+@api_router.get("/metrics", response_class=PlainTextResponse)
+def get_metrics() -> PlainTextResponse:
+    return PlainTextResponse(
+        render_metrics(),
+        media_type="text/plain; version=0.0.4; charset=utf-8",
+    )
@@ -1,5 +1,6 @@
 from pathlib import Path
 import os
+import tempfile
 
 
 class Settings:
@@ -9,6 +10,17 @@ class Settings:
             self.data_dir = Path(env_value)
         else:
             self.data_dir = Path(__file__).resolve().parent.parent / "data"
+        self.metrics_enabled = os.getenv("UIDAI_METRICS", "1") != "0"
+        self.profiling_enabled = os.getenv("UIDAI_PROFILING", "0") == "1"
+        self.profile_interval = float(os.getenv("UIDAI_PROFILE_INTERVAL", "0.005"))
+        profile_dir = os.getenv("UIDAI_PROFILE_DIR")
+        if profile_dir:
+            self.profile_dir = Path(profile_dir)
+        else:
+            self.profile_dir = Path(tempfile.gettempdir()) / "uidai-profiles"
+        shared_dir = os.getenv("UIDAI_SHARED_DIR")
+        self.shared_dir = Path(shared_dir) if shared_dir else None
+        self.shared_refresh_interval = float(os.getenv("UIDAI_SHARED_REFRESH", "2.0"))
 
 
 settings = Settings()
@@ -0,0 +1,271 @@
+import functools
+import inspect
+import os
+import sys
+import threading
+import time
+import uuid
+from bisect import bisect_left
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar, Token
+from pathlib import Path
+from typing import Any, Callable, ContextManager, Dict, Iterator, List, Optional, Tuple
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute
+from pydantic import BaseModel
+
+from .config import settings
+
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+
+
+class StageHistograms:
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._counts: Dict[str, List[int]] = {}
+        self._sums: Dict[str, float] = {}
+
+    def observe(self, stage: str, seconds: float) -> None:
+        index = bisect_left(self.buckets, seconds)
+        with self._lock:
+            counts = self._counts.get(stage)
+            if counts is None:
+                counts = [0] * (len(self.buckets) + 1)
+                self._counts[stage] = counts
+                self._sums[stage] = 0.0
+            counts[index] += 1
+            self._sums[stage] += seconds
+
+    def render(self, name: str = "uidai_stage_duration_seconds") -> str:
+        worker = os.getpid()
+        with self._lock:
+            snapshot = {
+                stage: (list(counts), self._sums[stage])
+                for stage, counts in self._counts.items()
+            }
+        lines = [
+            f"# HELP {name} Time spent in instrumented loader and analytics stages, per worker.",
+            f"# TYPE {name} histogram",
+        ]
+        for stage in sorted(snapshot):
+            counts, total = snapshot[stage]
+            cumulative = 0
+            labels = f'worker="{worker}",stage="{stage}"'
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+            cumulative += counts[-1]
+            lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {cumulative}')
+            lines.append(f'{name}_sum{{{labels}}} {total}')
+            lines.append(f'{name}_count{{{labels}}} {cumulative}')
+        return "\n".join(lines) + "\n"
+
+
+class StackSampler:
+    def __init__(self, interval: float) -> None:
+        self.interval = interval
+        self.stacks: Dict[str, int] = {}
+        self._threads: Dict[int, int] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def attach(self, ident: int) -> None:
+        with self._lock:
+            self._threads[ident] = self._threads.get(ident, 0) + 1
+
+    def detach(self, ident: int) -> None:
+        with self._lock:
+            depth = self._threads.get(ident, 0) - 1
+            if depth > 0:
+                self._threads[ident] = depth
+            else:
+                self._threads.pop(ident, None)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            with self._lock:
+                idents = list(self._threads)
+            if not idents:
+                continue
+            frames = sys._current_frames()
+            for ident in idents:
+                frame = frames.get(ident)
+                if frame is None:
+                    continue
+                key = _collapse_stack(frame)
+                self.stacks[key] = self.stacks.get(key, 0) + 1
+
+    def dump(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        ordered = sorted(self.stacks.items(), key=lambda item: item[1], reverse=True)
+        path.write_text("".join(f"{stack} {count}\n" for stack, count in ordered))
+
+
+def _collapse_stack(frame) -> str:
+    names: List[str] = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{code.co_name} ({Path(code.co_filename).name}:{frame.f_lineno})")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+class RequestProfile:
+    def __init__(self, sample: bool) -> None:
+        self.id = uuid.uuid4().hex
+        self.start = time.perf_counter()
+        self.timings: Dict[str, float] = {}
+        self.sampler: Optional[StackSampler] = None
+        if sample:
+            self.sampler = StackSampler(settings.profile_interval)
+            self.sampler.start()
+
+    def record(self, name: str, seconds: float) -> None:
+        self.timings[name] = self.timings.get(name, 0.0) + seconds
+
+    def server_timing(self, total: float) -> str:
+        entries = [f"{name};dur={seconds * 1000:.3f}" for name, seconds in self.timings.items()]
+        entries.append(f"total;dur={total * 1000:.3f}")
+        return ", ".join(entries)
+
+
+stage_histograms = StageHistograms()
+_current_profile: ContextVar[Optional[RequestProfile]] = ContextVar(
+    "uidai_request_profile", default=None
+)
+_NULL_STAGE = nullcontext()
+
+
+def stage(name: str) -> ContextManager[None]:
+    if not settings.metrics_enabled:
+        return _NULL_STAGE
+    return _timed_stage(name)
+
+
+@contextmanager
+def _timed_stage(name: str) -> Iterator[None]:
+    profile = _current_profile.get()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        stage_histograms.observe(name, elapsed)
+        if profile is not None:
+            profile.record(name, elapsed)
+
+
+@contextmanager
+def sampled_thread() -> Iterator[None]:
+    profile = _current_profile.get()
+    sampler = profile.sampler if profile is not None else None
+    if sampler is None:
+        yield
+        return
+    ident = threading.get_ident()
+    sampler.attach(ident)
+    try:
+        yield
+    finally:
+        sampler.detach(ident)
+
+
+def _serialized(result: Any, stage_name: str, status_code: int) -> Any:
+    if not isinstance(result, BaseModel):
+        return result
+    with stage(stage_name):
+        content = result.model_dump(mode="json", by_alias=True)
+    return InstrumentedJSONResponse(content, status_code=status_code)
+
+
+def _instrumented_endpoint(
+    endpoint: Callable[..., Any], stage_name: str, status_code: int
+) -> Callable[..., Any]:
+    if getattr(endpoint, "_instrumented", False):
+        return endpoint
+    if inspect.iscoroutinefunction(endpoint):
+
+        @functools.wraps(endpoint)
+        async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+            with sampled_thread():
+                result = await endpoint(*args, **kwargs)
+                return _serialized(result, stage_name, status_code)
+
+        async_wrapper._instrumented = True
+        return async_wrapper
+
+    @functools.wraps(endpoint)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        with sampled_thread():
+            result = endpoint(*args, **kwargs)
+            return _serialized(result, stage_name, status_code)
+
+    wrapper._instrumented = True
+    return wrapper
+
+
+class InstrumentedRoute(APIRoute):
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs: Any) -> None:
+        name = kwargs.get("name") or endpoint.__name__
+        status_code = kwargs.get("status_code") or 200
+        endpoint = _instrumented_endpoint(endpoint, f"{name}.serialize", status_code)
+        super().__init__(path, endpoint, **kwargs)
+
+
+def begin_request(sample: bool) -> Tuple[RequestProfile, Token]:
+    profile = RequestProfile(sample=sample)
+    if profile.sampler is not None:
+        profile.sampler.attach(threading.get_ident())
+    return profile, _current_profile.set(profile)
+
+
+def end_request(profile: RequestProfile, token: Token) -> Dict[str, str]:
+    _current_profile.reset(token)
+    total = time.perf_counter() - profile.start
+    stage_histograms.observe("request", total)
+    headers = {
+        "Server-Timing": profile.server_timing(total),
+        "Timing-Allow-Origin": "*",
+    }
+    if profile.sampler is not None:
+        profile.sampler.stop()
+        path = settings.profile_dir / f"{profile.id}.folded"
+        profile.sampler.dump(path)
+        headers["X-Profile-Dump"] = str(path)
+    return headers
+
+
+def render_metrics() -> str:
+    return stage_histograms.render()
+
+
+class InstrumentedJSONResponse(JSONResponse):
+    def render(self, content) -> bytes:
+        with stage("response.render"):
+            return super().render(content)
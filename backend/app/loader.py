@@ -0,0 +1,36 @@
+import argparse
+import time
+
+from .core.config import settings
+from .services.data_loader import DatasetManager
+from .services.shared_store import data_fingerprint, publish_datasets
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Materialize datasets into memory-mapped Arrow files for multi-worker serving.",
+    )
+    parser.add_argument("--watch", action="store_true", help="republish when data files change")
+    parser.add_argument("--interval", type=float, default=5.0, help="seconds between checks")
+    args = parser.parse_args()
+    if settings.shared_dir is None:
+        parser.error("UIDAI_SHARED_DIR must be set")
+
+    published = None
+    while True:
+        fingerprint = data_fingerprint(settings.data_dir)
+        if fingerprint != published:
+            manager = DatasetManager(settings.data_dir)
+            manifest = publish_datasets(manager, settings.shared_dir, fingerprint)
+            versions = ", ".join(
+                f"{name} v{entry['version']}" for name, entry in manifest["datasets"].items()
+            )
+            print(f"Published generation {manifest['generation']}: {versions}", flush=True)
+            published = fingerprint
+        if not args.watch:
+            break
+        time.sleep(args.interval)
+
+
+if __name__ == "__main__":
+    main()
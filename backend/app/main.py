@@ -1,11 +1,15 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.middleware.base import BaseHTTPMiddleware
 
 from .api.router import api_router
+from .core.config import settings
+from .core.instrumentation import InstrumentedJSONResponse, begin_request, end_request
 
 app = FastAPI(
     title="UIDAI Analytics API",
     version="0.1.0",
+    default_response_class=InstrumentedJSONResponse,
 )
 
 app.add_middleware(
@@ -14,8 +18,24 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing", "X-Profile-Dump"],
 )
 
-app.include_router(api_router, prefix="/api")
 
+async def instrument_requests(request: Request, call_next):
+    sample = settings.profiling_enabled and request.headers.get("X-Profile") == "1"
+    profile, token = begin_request(sample=sample)
+    try:
+        response = await call_next(request)
+    finally:
+        headers = end_request(profile, token)
+    response.headers.update(headers)
+    return response
+
+
+if settings.metrics_enabled:
+    app.add_middleware(BaseHTTPMiddleware, dispatch=instrument_requests)
+
+
+app.include_router(api_router, prefix="/api")
 
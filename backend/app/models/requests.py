@@ -0,0 +1,25 @@
+from typing import Any, Dict, List, Literal, Optional, Union
+
+from pydantic import BaseModel, Field
+
+
+class BatchQuery(BaseModel):
+    type: Literal["summary", "trends", "groupby", "anomalies", "quality", "clusters"]
+    metrics: Optional[List[str]] = None
+    metric: Optional[str] = None
+    dimensions: Optional[List[str]] = None
+    group_by: Optional[Union[str, List[str]]] = None
+    date_field: Optional[str] = None
+    freq: str = "M"
+    agg: str = "sum"
+    method: str = "iqr"
+    n_clusters: int = Field(3, ge=1, le=10)
+
+
+class BatchRequest(BaseModel):
+    dataset: str
+    queries: List[BatchQuery] = Field(..., min_length=1, max_length=50)
+
+
+class IngestRequest(BaseModel):
+    rows: List[Dict[str, Any]] = Field(..., min_length=1)
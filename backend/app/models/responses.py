@@ -19,6 +19,7 @@ class DatasetSchema(BaseModel):
     categorical_fields: List[str]
     datetime_fields: List[str]
     primary_date_field: Optional[str]
+    version: int
     schema: List[ColumnSchema]
 
 
@@ -49,6 +50,7 @@ class SchemaResponse(BaseModel):
                     categorical_fields=schema_info["categorical_fields"],
                     datetime_fields=schema_info["datetime_fields"],
                     primary_date_field=schema_info.get("primary_date_field"),
+                    version=info.get("version", 1),
                     schema=columns,
                 )
             )
@@ -83,3 +85,24 @@ class ClusterSummaryResponse(BaseModel):
 class QualityResponse(BaseModel):
     dataset: str
     result: Dict[str, Any]
+
+
+class BatchResult(BaseModel):
+    type: str
+    result: Dict[str, Any]
+
+
+class BatchResponse(BaseModel):
+    dataset: str
+    results: List[BatchResult]
+
+
+class ForecastResponse(BaseModel):
+    dataset: str
+    result: Dict[str, Any]
+
+
+class IngestResponse(BaseModel):
+    dataset: str
+    version: int
+    rows: int
@@ -1,14 +1,86 @@
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
 
+from ..core.instrumentation import stage
+from .time_buckets import PeriodKeys, aggregate_periods, build_period_keys, supports_bucketing
+
+
+class AnalyticsContext:
+    def __init__(
+        self,
+        df: pd.DataFrame,
+        schema: Dict[str, Any],
+        period_keys: Optional[Dict[str, Optional[PeriodKeys]]] = None,
+    ) -> None:
+        self.df = df
+        self.schema = schema
+        self._period_keys = period_keys if period_keys is not None else {}
+        self._dates: Dict[str, pd.Series] = {}
+        self._dated_rows: Dict[str, Tuple[np.ndarray, pd.DatetimeIndex]] = {}
+        self._series: Dict[str, pd.Series] = {}
+        self._iqr: Dict[str, Tuple[float, float, pd.Series]] = {}
+        self._groupers: Dict[Tuple[str, ...], Any] = {}
+        self._null_ratios: Optional[pd.Series] = None
+
+    def dates(self, column: str) -> pd.Series:
+        if column not in self._dates:
+            with stage("shared.parse_dates"):
+                self._dates[column] = pd.to_datetime(self.df[column], errors="coerce")
+        return self._dates[column]
+
+    def dated_rows(self, column: str) -> Tuple[np.ndarray, pd.DatetimeIndex]:
+        if column not in self._dated_rows:
+            dates = self.dates(column)
+            with stage("shared.filter_dates"):
+                mask = dates.notna().to_numpy()
+                index = pd.DatetimeIndex(dates[mask], name=column)
+            self._dated_rows[column] = (mask, index)
+        return self._dated_rows[column]
+
+    def period_keys(self, column: str) -> Optional[PeriodKeys]:
+        if column not in self._period_keys:
+            dates = self.dates(column)
+            with stage("shared.period_keys"):
+                self._period_keys[column] = build_period_keys(dates)
+        return self._period_keys[column]
+
+    def series(self, column: str) -> pd.Series:
+        if column not in self._series:
+            self._series[column] = self.df[column].dropna()
+        return self._series[column]
+
+    def iqr_bounds(self, column: str) -> Tuple[float, float, pd.Series]:
+        if column not in self._iqr:
+            series = self.series(column)
+            with stage("shared.quantiles"):
+                q1, q3 = series.quantile([0.25, 0.75]).tolist()
+                iqr = q3 - q1 or 1.0
+                lower = float(q1 - 1.5 * iqr)
+                upper = float(q3 + 1.5 * iqr)
+                mask = (series < lower) | (series > upper)
+            self._iqr[column] = (lower, upper, mask)
+        return self._iqr[column]
+
+    def groupby(self, columns: List[str]):
+        key = tuple(columns)
+        if key not in self._groupers:
+            self._groupers[key] = self.df.groupby(list(columns), dropna=False)
+        return self._groupers[key]
+
+    def null_ratios(self) -> pd.Series:
+        if self._null_ratios is None:
+            self._null_ratios = self.df.isna().mean()
+        return self._null_ratios
+
 
 def compute_summary_statistics(
     df: pd.DataFrame,
     schema: Dict[str, Any],
     metrics: Optional[List[str]] = None,
     group_by: Optional[List[str]] = None,
+    context: Optional[AnalyticsContext] = None,
 ) -> Dict[str, Any]:
     numeric_fields = schema["numeric_fields"]
     if metrics:
@@ -16,24 +88,28 @@ def compute_summary_statistics(
     if not numeric_fields:
         return {"groups": [], "summary": {}}
 
-    working = df.copy()
+    context = context or AnalyticsContext(df, schema)
 
     if group_by:
-        group_cols = [g for g in group_by if g in working.columns]
+        group_cols = [g for g in group_by if g in df.columns]
     else:
         group_cols = []
 
     if group_cols:
-        grouped = working.groupby(group_cols, dropna=False)[numeric_fields]
-        stats = grouped.agg(["count", "mean", "std", "min", "max"])
-        stats = stats.reset_index()
-        records = stats.to_dict(orient="records")
+        with stage("summary.aggregate"):
+            grouped = context.groupby(group_cols)[numeric_fields]
+            stats = grouped.agg(["count", "mean", "std", "min", "max"])
+            stats = stats.reset_index()
+        with stage("summary.to_records"):
+            records = stats.to_dict(orient="records")
         return {"groups": group_cols, "summary": records}
 
-    stats = working[numeric_fields].agg(
-        ["count", "mean", "std", "min", "max", "median"]
-    )
-    result = stats.to_dict()
+    with stage("summary.aggregate"):
+        stats = df[numeric_fields].agg(
+            ["count", "mean", "std", "min", "max", "median"]
+        )
+    with stage("summary.to_records"):
+        result = stats.to_dict()
     return {"groups": [], "summary": result}
 
 
@@ -44,6 +120,7 @@ def compute_trends(
     metric: Optional[str] = None,
     freq: str = "M",
     group_by: Optional[str] = None,
+    context: Optional[AnalyticsContext] = None,
 ) -> Dict[str, Any]:
     datetime_fields = schema["datetime_fields"]
     if not datetime_fields:
@@ -53,43 +130,48 @@ def compute_trends(
     if date_col not in df.columns:
         return {"date_field": None, "series": []}
 
-    working = df.copy()
-    working[date_col] = pd.to_datetime(working[date_col], errors="coerce")
-    working = working.dropna(subset=[date_col])
-
     numeric_fields = schema["numeric_fields"]
     if metric and metric in numeric_fields:
+        if metric == group_by:
+            raise ValueError(f"Cannot group trends of {metric} by the same column")
         value_cols = [metric]
     else:
-        value_cols = numeric_fields[:1]
+        value_cols = [field for field in numeric_fields if field != group_by][:1]
     if not value_cols:
         return {"date_field": date_col, "series": []}
 
-    working = working.set_index(date_col)
+    context = context or AnalyticsContext(df, schema)
+    grouped = bool(group_by and group_by in df.columns)
+    keys = None
+    if supports_bucketing(df, value_cols, freq):
+        keys = context.period_keys(date_col)
 
-    if group_by and group_by in df.columns:
-        grouped = (
-            working.groupby(group_by)[value_cols]
-            .resample(freq)
-            .sum()
-            .reset_index()
-            .rename(columns={date_col: "period"})
-        )
-        records = grouped.to_dict(orient="records")
-        return {
-            "date_field": date_col,
-            "frequency": freq,
-            "group_by": group_by,
-            "series": records,
-        }
-
-    aggregated = working[value_cols].resample(freq).sum().reset_index()
-    aggregated = aggregated.rename(columns={date_col: "period"})
-    records = aggregated.to_dict(orient="records")
+    if keys is not None:
+        with stage("trends.bucket"):
+            aggregated = aggregate_periods(
+                df,
+                keys,
+                freq,
+                value_cols,
+                group_by=group_by if grouped else None,
+            )
+    else:
+        mask, index = context.dated_rows(date_col)
+        columns = value_cols + [group_by] if grouped else value_cols
+        working = df.loc[mask, columns].set_axis(index, axis=0)
+        with stage("trends.resample"):
+            if grouped:
+                aggregated = working.groupby(group_by)[value_cols].resample(freq).sum()
+            else:
+                aggregated = working[value_cols].resample(freq).sum()
+            aggregated = aggregated.reset_index().rename(columns={date_col: "period"})
+
+    with stage("trends.to_records"):
+        records = aggregated.to_dict(orient="records")
     return {
         "date_field": date_col,
         "frequency": freq,
-        "group_by": None,
+        "group_by": group_by if grouped else None,
         "series": records,
     }
 
@@ -100,6 +182,7 @@ def compute_groupby_analytics(
     dimensions: Optional[List[str]] = None,
     metrics: Optional[List[str]] = None,
     agg: str = "sum",
+    context: Optional[AnalyticsContext] = None,
 ) -> Dict[str, Any]:
     if not dimensions:
         return {"dimensions": [], "result": []}
@@ -116,19 +199,22 @@ def compute_groupby_analytics(
     if not value_cols:
         return {"dimensions": dim_cols, "result": []}
 
-    grouped = df.groupby(dim_cols, dropna=False)[value_cols]
+    context = context or AnalyticsContext(df, schema)
+    with stage("groupby.aggregate"):
+        grouped = context.groupby(dim_cols)[value_cols]
 
-    if agg == "mean":
-        aggregated = grouped.mean()
-    elif agg == "max":
-        aggregated = grouped.max()
-    elif agg == "min":
-        aggregated = grouped.min()
-    else:
-        aggregated = grouped.sum()
+        if agg == "mean":
+            aggregated = grouped.mean()
+        elif agg == "max":
+            aggregated = grouped.max()
+        elif agg == "min":
+            aggregated = grouped.min()
+        else:
+            aggregated = grouped.sum()
 
-    aggregated = aggregated.reset_index()
-    records = aggregated.to_dict(orient="records")
+        aggregated = aggregated.reset_index()
+    with stage("groupby.to_records"):
+        records = aggregated.to_dict(orient="records")
     return {"dimensions": dim_cols, "result": records}
 
 
@@ -138,44 +224,43 @@ def compute_anomaly_overview(
     metric: Optional[str] = None,
     group_by: Optional[str] = None,
     method: str = "iqr",
+    context: Optional[AnalyticsContext] = None,
 ) -> Dict[str, Any]:
     numeric_fields = schema["numeric_fields"]
     if not numeric_fields:
         return {"metric": None, "method": method, "overview": []}
 
     target = metric if metric in numeric_fields else numeric_fields[0]
-    series = df[target].dropna()
+    context = context or AnalyticsContext(df, schema)
+    series = context.series(target)
     if series.empty:
         return {"metric": target, "method": method, "overview": []}
 
-    if method == "zscore":
-        mean = series.mean()
-        std = series.std(ddof=0) or 1.0
-        z_scores = (series - mean) / std
-        threshold = 3.0
-        mask = z_scores.abs() > threshold
-        lower = float(mean - threshold * std)
-        upper = float(mean + threshold * std)
-    else:
-        q1 = series.quantile(0.25)
-        q3 = series.quantile(0.75)
-        iqr = q3 - q1 or 1.0
-        lower = float(q1 - 1.5 * iqr)
-        upper = float(q3 + 1.5 * iqr)
-        mask = (series < lower) | (series > upper)
-
-    anomalies = df.loc[series.index[mask]]
+    with stage("anomalies.detect"):
+        if method == "zscore":
+            mean = series.mean()
+            std = series.std(ddof=0) or 1.0
+            z_scores = (series - mean) / std
+            threshold = 3.0
+            mask = z_scores.abs() > threshold
+            lower = float(mean - threshold * std)
+            upper = float(mean + threshold * std)
+        else:
+            lower, upper, mask = context.iqr_bounds(target)
+
+        anomalies = df.loc[series.index[mask]]
     total_count = int(len(series))
     anomaly_count = int(mask.sum())
     ratio = float(anomaly_count / total_count) if total_count else 0.0
 
     if group_by and group_by in df.columns:
-        group_counts = (
-            anomalies.groupby(group_by)[target]
-                .agg(anomaly_count="count", anomaly_mean="mean")
-                .reset_index()
-        )
-        group_records = group_counts.to_dict(orient="records")
+        with stage("anomalies.by_group"):
+            group_counts = (
+                anomalies.groupby(group_by)[target]
+                    .agg(anomaly_count="count", anomaly_mean="mean")
+                    .reset_index()
+            )
+            group_records = group_counts.to_dict(orient="records")
     else:
         group_records = []
 
@@ -195,12 +280,16 @@ def compute_anomaly_overview(
 def compute_quality_overview(
     df: pd.DataFrame,
     schema: Dict[str, Any],
+    context: Optional[AnalyticsContext] = None,
 ) -> Dict[str, Any]:
+    context = context or AnalyticsContext(df, schema)
     total_rows = int(len(df))
     col_completeness = []
-    for name in df.columns:
-        non_null_ratio = float(1.0 - df[name].isna().mean())
-        col_completeness.append({"column": name, "non_null_ratio": non_null_ratio})
+    with stage("quality.completeness"):
+        null_ratios = context.null_ratios()
+        for name in df.columns:
+            non_null_ratio = float(1.0 - null_ratios[name])
+            col_completeness.append({"column": name, "non_null_ratio": non_null_ratio})
     if col_completeness:
         col_completeness_sorted = sorted(
             col_completeness, key=lambda x: x["non_null_ratio"]
@@ -221,7 +310,7 @@ def compute_quality_overview(
     recency_days = None
     if date_col and date_col in df.columns:
         try:
-            s = pd.to_datetime(df[date_col], errors="coerce")
+            s = context.dates(date_col)
             s = s.dropna()
             if not s.empty:
                 try:
@@ -238,14 +327,9 @@ def compute_quality_overview(
     anomaly_ratio = 0.0
     if numeric_fields:
         target = numeric_fields[0]
-        series = df[target].dropna()
+        series = context.series(target)
         if not series.empty:
-            q1 = series.quantile(0.25)
-            q3 = series.quantile(0.75)
-            iqr = q3 - q1 or 1.0
-            lower = float(q1 - 1.5 * iqr)
-            upper = float(q3 + 1.5 * iqr)
-            mask = (series < lower) | (series > upper)
+            lower, upper, mask = context.iqr_bounds(target)
             total_count = int(len(series))
             anomaly_ratio = (
                 float(mask.sum() / total_count) if total_count else 0.0
@@ -0,0 +1,93 @@
+import json
+from typing import Any, Dict, List, Optional, Union
+
+import pandas as pd
+
+from .analytics import (
+    AnalyticsContext,
+    compute_anomaly_overview,
+    compute_groupby_analytics,
+    compute_quality_overview,
+    compute_summary_statistics,
+    compute_trends,
+)
+from .ml import compute_kmeans_clusters
+from .time_buckets import PeriodKeys
+
+
+def run_batch(
+    df: pd.DataFrame,
+    schema: Dict[str, Any],
+    queries: List[Dict[str, Any]],
+    period_keys: Optional[Dict[str, Optional[PeriodKeys]]] = None,
+) -> List[Dict[str, Any]]:
+    context = AnalyticsContext(df, schema, period_keys=period_keys)
+    computed: Dict[str, Dict[str, Any]] = {}
+    results: List[Dict[str, Any]] = []
+    for query in queries:
+        key = json.dumps(query, sort_keys=True, default=str)
+        if key not in computed:
+            computed[key] = _run_query(context, query)
+        results.append({"type": query["type"], "result": computed[key]})
+    return results
+
+
+def _run_query(context: AnalyticsContext, query: Dict[str, Any]) -> Dict[str, Any]:
+    df = context.df
+    schema = context.schema
+    kind = query["type"]
+    if kind == "summary":
+        return compute_summary_statistics(
+            df,
+            schema,
+            metrics=query.get("metrics"),
+            group_by=_as_list(query.get("group_by")),
+            context=context,
+        )
+    if kind == "trends":
+        return compute_trends(
+            df,
+            schema,
+            date_field=query.get("date_field"),
+            metric=query.get("metric"),
+            freq=query.get("freq") or "M",
+            group_by=_as_single(query.get("group_by")),
+            context=context,
+        )
+    if kind == "groupby":
+        return compute_groupby_analytics(
+            df,
+            schema,
+            dimensions=query.get("dimensions"),
+            metrics=query.get("metrics"),
+            agg=query.get("agg") or "sum",
+            context=context,
+        )
+    if kind == "anomalies":
+        return compute_anomaly_overview(
+            df,
+            schema,
+            metric=query.get("metric"),
+            group_by=_as_single(query.get("group_by")),
+            method=query.get("method") or "iqr",
+            context=context,
+        )
+    if kind == "quality":
+        return compute_quality_overview(df, schema, context=context)
+    if kind == "clusters":
+        return compute_kmeans_clusters(df, schema, n_clusters=query.get("n_clusters") or 3)
+    raise ValueError(f"Unsupported query type: {kind}")
+
+
+def _as_list(value: Optional[Union[str, List[str]]]) -> Optional[List[str]]:
+    if value is None or isinstance(value, list):
+        return value
+    return [value]
+
+
+def _as_single(value: Optional[Union[str, List[str]]]) -> Optional[str]:
+    if not isinstance(value, list):
+        return value
+    if len(value) > 1:
+        raise ValueError("group_by accepts a single column for this query type")
+    return value[0] if value else None
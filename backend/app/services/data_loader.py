@@ -1,18 +1,40 @@
+import threading
+import time
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
+from pandas.tseries.api import guess_datetime_format
 
 from ..core.config import settings
+from ..core.instrumentation import stage
 from .schema_inference import infer_schema
+from .shared_store import attach_dataset, manifest_stamp, read_manifest
+from .time_buckets import PeriodKeys, build_period_keys
 
 
 class DatasetManager:
-    def __init__(self, data_dir: Path) -> None:
+    def __init__(
+        self,
+        data_dir: Path,
+        shared_dir: Optional[Path] = None,
+        refresh_interval: float = 2.0,
+    ) -> None:
         self.data_dir = data_dir
+        self.shared_dir = shared_dir
+        self.refresh_interval = refresh_interval
         self._dataframes: Dict[str, pd.DataFrame] = {}
         self._metadata: Dict[str, Dict[str, Any]] = {}
-        self._discover_datasets()
+        self._period_keys: Dict[str, Dict[str, Optional[PeriodKeys]]] = {}
+        self._date_formats: Dict[str, Dict[str, Optional[str]]] = {}
+        self._lock = threading.Lock()
+        self._manifest_stamp: Optional[tuple] = None
+        self._checked_at = float("-inf")
+        if shared_dir is None:
+            self._discover_datasets()
+        else:
+            self._refresh_shared()
 
     def _discover_datasets(self) -> None:
         if not self.data_dir.exists():
@@ -22,18 +44,65 @@ class DatasetManager:
                 continue
             if path.suffix.lower() not in {".csv", ".parquet", ".pq", ".xlsx", ".xls"}:
                 continue
-            df = self._load_file(path)
+            with stage("dataset.load"):
+                df = self._load_file(path)
             name = path.stem
-            schema = infer_schema(df)
+            with stage("dataset.infer_schema"):
+                schema = infer_schema(df)
             self._dataframes[name] = df
+            self._period_keys[name] = {}
+            self._date_formats[name] = {}
+            primary_date_field = schema["primary_date_field"]
+            if primary_date_field:
+                with stage("dataset.period_keys"):
+                    date_format = _infer_date_format(df[primary_date_field])
+                    dates = pd.to_datetime(
+                        df[primary_date_field], format=date_format, errors="coerce"
+                    )
+                    self._period_keys[name][primary_date_field] = build_period_keys(dates)
+                    self._date_formats[name][primary_date_field] = date_format
             self._metadata[name] = {
                 "name": name,
                 "path": str(path),
                 "rows": int(df.shape[0]),
                 "columns": int(df.shape[1]),
                 "schema": schema,
+                "version": 1,
+                "base_version": 1,
             }
 
+    def _refresh_shared(self) -> None:
+        if self.shared_dir is None:
+            return
+        now = time.monotonic()
+        if now - self._checked_at < self.refresh_interval:
+            return
+        self._checked_at = now
+        stamp = manifest_stamp(self.shared_dir)
+        if stamp is None or stamp == self._manifest_stamp:
+            return
+        with self._lock:
+            if stamp == self._manifest_stamp:
+                return
+            manifest = read_manifest(self.shared_dir)
+            if manifest is None:
+                return
+            dataframes: Dict[str, pd.DataFrame] = {}
+            period_keys: Dict[str, Dict[str, Optional[PeriodKeys]]] = {}
+            metadata: Dict[str, Dict[str, Any]] = {}
+            for name, entry in manifest["datasets"].items():
+                current = self._metadata.get(name)
+                if current is not None and current["version"] == entry["version"]:
+                    dataframes[name] = self._dataframes[name]
+                    period_keys[name] = self._period_keys[name]
+                else:
+                    dataframes[name], period_keys[name] = attach_dataset(self.shared_dir, entry)
+                metadata[name] = entry
+            self._dataframes = dataframes
+            self._period_keys = period_keys
+            self._metadata = metadata
+            self._manifest_stamp = stamp
+
     def _load_file(self, path: Path) -> pd.DataFrame:
         suffix = path.suffix.lower()
         if suffix == ".csv":
@@ -45,9 +114,11 @@ class DatasetManager:
         raise ValueError(f"Unsupported file type: {suffix}")
 
     def list_datasets(self) -> Dict[str, Dict[str, Any]]:
+        self._refresh_shared()
         return self._metadata
 
     def get_dataframe(self, name: str) -> pd.DataFrame:
+        self._refresh_shared()
         if name not in self._dataframes:
             raise KeyError(f"Dataset not found: {name}")
         return self._dataframes[name]
@@ -57,8 +128,101 @@ class DatasetManager:
             raise KeyError(f"Dataset not found: {name}")
         return self._metadata[name]["schema"]
 
+    def get_period_keys(
+        self, name: str, df: Optional[pd.DataFrame] = None
+    ) -> Dict[str, Optional[PeriodKeys]]:
+        if name not in self._period_keys:
+            raise KeyError(f"Dataset not found: {name}")
+        period_keys = self._period_keys[name]
+        if df is not None and df is not self._dataframes.get(name):
+            return {}
+        return period_keys
+
+    def get_version(self, name: str) -> Dict[str, int]:
+        if name not in self._metadata:
+            raise KeyError(f"Dataset not found: {name}")
+        info = self._metadata[name]
+        return {
+            "version": info["version"],
+            "base_version": info["base_version"],
+            "rows": info["rows"],
+        }
+
+    def snapshot(
+        self, name: str
+    ) -> Tuple[pd.DataFrame, Dict[str, Optional[PeriodKeys]], Dict[str, int]]:
+        self._refresh_shared()
+        with self._lock:
+            if name not in self._dataframes:
+                raise KeyError(f"Dataset not found: {name}")
+            return self._dataframes[name], self._period_keys[name], self.get_version(name)
+
+    def append_rows(self, name: str, records: List[Dict[str, Any]]) -> Dict[str, Any]:
+        if self.shared_dir is not None:
+            raise RuntimeError("Datasets served from shared memory are read-only")
+        with self._lock:
+            df = self.get_dataframe(name)
+            rows = pd.DataFrame.from_records(records).reindex(columns=df.columns)
+            with stage("dataset.append"):
+                rows = _coerce_rows(rows, df.dtypes)
+                combined = pd.concat([df, rows], ignore_index=True)
+            period_keys: Dict[str, Optional[PeriodKeys]] = {}
+            for column, keys in list(self._period_keys[name].items()):
+                if keys is None:
+                    period_keys[column] = None
+                    continue
+                with stage("dataset.period_keys"):
+                    if column not in self._date_formats[name]:
+                        self._date_formats[name][column] = _infer_date_format(combined[column])
+                    date_format = self._date_formats[name][column]
+                    dates = pd.to_datetime(rows[column], format=date_format, errors="coerce")
+                    period_keys[column] = keys.extend(dates, len(df))
+            metadata = dict(self._metadata[name])
+            metadata["rows"] = int(combined.shape[0])
+            metadata["version"] += 1
+            self._dataframes[name] = combined
+            self._period_keys[name] = period_keys
+            self._metadata[name] = metadata
+            return metadata
+
+
+def _infer_date_format(values: pd.Series) -> Optional[str]:
+    if not (pd.api.types.is_object_dtype(values) or pd.api.types.is_string_dtype(values)):
+        return None
+    first = values.first_valid_index()
+    if first is None or not isinstance(values[first], str):
+        return None
+    return guess_datetime_format(values[first])
+
+
+def _coerce_rows(rows: pd.DataFrame, dtypes: pd.Series) -> pd.DataFrame:
+    columns: Dict[str, pd.Series] = {}
+    for column, dtype in dtypes.items():
+        values = rows[column]
+        try:
+            if pd.api.types.is_bool_dtype(dtype):
+                if not values.map(lambda value: isinstance(value, (bool, np.bool_))).all():
+                    raise ValueError("expected true or false")
+            elif pd.api.types.is_numeric_dtype(dtype):
+                values = pd.to_numeric(values)
+                if pd.api.types.is_integer_dtype(dtype):
+                    if values.isna().any():
+                        raise ValueError("missing value")
+                    if not (values == values.round()).all():
+                        raise ValueError("expected an integer")
+            elif pd.api.types.is_datetime64_any_dtype(dtype):
+                values = pd.to_datetime(values)
+            columns[column] = values.astype(dtype)
+        except (TypeError, ValueError) as exc:
+            raise ValueError(f"Column {column} cannot be stored as {dtype}: {exc}") from exc
+    return pd.DataFrame(columns, index=rows.index)
+
 
-_dataset_manager: DatasetManager = DatasetManager(settings.data_dir)
+_dataset_manager: DatasetManager = DatasetManager(
+    settings.data_dir,
+    shared_dir=settings.shared_dir,
+    refresh_interval=settings.shared_refresh_interval,
+)
 
 
 def get_dataset_manager() -> DatasetManager:
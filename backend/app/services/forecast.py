@@ -0,0 +1,357 @@
+import copy
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ..core.instrumentation import stage
+from .analytics import AnalyticsContext
+from .time_buckets import FREQ_BUCKETS, PeriodKeys, bucket_rows, supports_bucketing
+
+SEASON_LENGTHS: Dict[str, int] = {"D": 7, "W": 52, "M": 12, "Q": 4, "Y": 1}
+INTERVAL_Z = 1.96
+
+
+class LinearTrendModel:
+    def __init__(self, starts: np.ndarray) -> None:
+        n_series = len(starts)
+        self.starts = starts
+        self.count = np.zeros(n_series)
+        self.t_sum = np.zeros(n_series)
+        self.tt_sum = np.zeros(n_series)
+        self.y_sum = np.zeros(n_series)
+        self.ty_sum = np.zeros(n_series)
+        self.yy_sum = np.zeros(n_series)
+
+    def update(self, block: np.ndarray, start: int) -> None:
+        t = np.arange(start, start + block.shape[1], dtype=np.float64)
+        active = (t[None, :] >= self.starts[:, None]).astype(np.float64)
+        values = block * active
+        self.count += active.sum(axis=1)
+        self.t_sum += active @ t
+        self.tt_sum += active @ (t * t)
+        self.y_sum += values.sum(axis=1)
+        self.ty_sum += values @ t
+        self.yy_sum += (values * block).sum(axis=1)
+
+    def forecast(self, start: int, horizon: int) -> Tuple[np.ndarray, np.ndarray]:
+        count = np.maximum(self.count, 1.0)
+        denom = self.count * self.tt_sum - self.t_sum ** 2
+        slope = np.divide(
+            self.count * self.ty_sum - self.t_sum * self.y_sum,
+            denom,
+            out=np.zeros_like(denom),
+            where=denom > 0,
+        )
+        intercept = (self.y_sum - slope * self.t_sum) / count
+        sse = self.yy_sum - intercept * self.y_sum - slope * self.ty_sum
+        sigma = np.sqrt(np.maximum(sse, 0.0) / np.maximum(self.count - 2, 1.0))
+        t = np.arange(start, start + horizon, dtype=np.float64)
+        return intercept[:, None] + slope[:, None] * t, sigma
+
+
+class HoltModel:
+    def __init__(self, starts: np.ndarray, alpha: float, beta: float) -> None:
+        n_series = len(starts)
+        self.starts = starts
+        self.alpha = alpha
+        self.beta = beta
+        self.steps = np.zeros(n_series, dtype=np.int64)
+        self.level = np.zeros(n_series)
+        self.trend = np.zeros(n_series)
+        self.sse = np.zeros(n_series)
+        self.errors = np.zeros(n_series, dtype=np.int64)
+
+    def update(self, block: np.ndarray, start: int) -> None:
+        for offset, y in enumerate(block.T):
+            active = start + offset >= self.starts
+            first = active & (self.steps == 0)
+            second = active & (self.steps == 1)
+            regular = active & (self.steps >= 2)
+            predicted = self.level + self.trend
+            error = y - predicted
+            self.sse += np.where(regular, error * error, 0.0)
+            self.errors += regular
+            level = self.alpha * y + (1 - self.alpha) * predicted
+            trend = self.beta * (level - self.level) + (1 - self.beta) * self.trend
+            self.trend = np.where(regular, trend, np.where(second, y - self.level, self.trend))
+            self.level = np.where(regular, level, np.where(first | second, y, self.level))
+            self.steps += active
+
+    def forecast(self, start: int, horizon: int) -> Tuple[np.ndarray, np.ndarray]:
+        steps = np.arange(1, horizon + 1, dtype=np.float64)
+        mean = self.level[:, None] + self.trend[:, None] * steps
+        return mean, np.sqrt(self.sse / np.maximum(self.errors, 1))
+
+
+class SeasonalNaiveModel:
+    def __init__(self, starts: np.ndarray, season: int) -> None:
+        n_series = len(starts)
+        self.starts = starts
+        self.season = season
+        self.window = np.zeros((n_series, 0))
+        self.sse = np.zeros(n_series)
+        self.errors = np.zeros(n_series, dtype=np.int64)
+
+    def update(self, block: np.ndarray, start: int) -> None:
+        history = np.concatenate([self.window, block], axis=1)
+        lagged = history.shape[1] - self.season
+        if lagged > 0:
+            t = np.arange(start - self.window.shape[1], start - self.window.shape[1] + lagged)
+            valid = t[None, :] >= self.starts[:, None]
+            errors = history[:, self.season:] - history[:, :lagged]
+            self.sse += np.where(valid, errors * errors, 0.0).sum(axis=1)
+            self.errors += valid.sum(axis=1)
+        self.window = history[:, -self.season:]
+
+    def forecast(self, start: int, horizon: int) -> Tuple[np.ndarray, np.ndarray]:
+        n_series, width = self.window.shape
+        if width == 0:
+            return np.zeros((n_series, horizon)), np.zeros(n_series)
+        mean = self.window[:, np.arange(horizon) % width]
+        return mean, np.sqrt(self.sse / np.maximum(self.errors, 1))
+
+
+MODELS = ("holt", "linear", "seasonal_naive")
+
+
+def _new_model(model: str, starts: np.ndarray, bucket: str, alpha: float, beta: float):
+    if model == "linear":
+        return LinearTrendModel(starts)
+    if model == "seasonal_naive":
+        return SeasonalNaiveModel(starts, SEASON_LENGTHS[bucket])
+    return HoltModel(starts, alpha, beta)
+
+
+class FittedForecast:
+    def __init__(
+        self,
+        version: int,
+        base_version: int,
+        rows: int,
+        groups: Optional[pd.Index],
+        origin: int,
+        closed: int,
+        model: Any,
+        open_block: np.ndarray,
+    ) -> None:
+        self.version = version
+        self.base_version = base_version
+        self.rows = rows
+        self.groups = groups
+        self.origin = origin
+        self.closed = closed
+        self.model = model
+        self.open_block = open_block
+
+
+class ForecastCache:
+    def __init__(self, max_entries: int = 64) -> None:
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, FittedForecast]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[FittedForecast]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: Hashable, entry: FittedForecast) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+_forecast_cache = ForecastCache()
+
+
+def get_forecast_cache() -> ForecastCache:
+    return _forecast_cache
+
+
+def compute_forecast(
+    df: pd.DataFrame,
+    schema: Dict[str, Any],
+    date_field: Optional[str] = None,
+    metric: Optional[str] = None,
+    freq: str = "M",
+    group_by: Optional[str] = None,
+    horizon: int = 6,
+    model: str = "holt",
+    alpha: float = 0.5,
+    beta: float = 0.1,
+    context: Optional[AnalyticsContext] = None,
+    cache: Optional[ForecastCache] = None,
+    dataset: Optional[str] = None,
+    version: Optional[Dict[str, int]] = None,
+) -> Dict[str, Any]:
+    if model not in MODELS:
+        raise ValueError(f"Unsupported forecast model: {model}")
+
+    datetime_fields = schema["datetime_fields"]
+    if not datetime_fields:
+        return {"date_field": None, "series": []}
+
+    date_col = date_field or schema.get("primary_date_field") or datetime_fields[0]
+    if date_col not in df.columns:
+        return {"date_field": None, "series": []}
+
+    numeric_fields = schema["numeric_fields"]
+    candidates = [field for field in numeric_fields if field != group_by]
+    if metric and metric in numeric_fields:
+        if metric == group_by:
+            raise ValueError(f"Cannot group forecasts of {metric} by the same column")
+        target = metric
+    elif candidates:
+        target = candidates[0]
+    else:
+        return {"date_field": date_col, "series": []}
+    if not supports_bucketing(df, [target], freq):
+        raise ValueError(f"Unsupported forecast frequency or metric: {freq}, {target}")
+
+    context = context or AnalyticsContext(df, schema)
+    keys = context.period_keys(date_col)
+    if keys is None:
+        raise ValueError(f"Date field cannot be bucketed: {date_col}")
+
+    grouped = bool(group_by and group_by in df.columns)
+    group_col = group_by if grouped else None
+    bucket = FREQ_BUCKETS[freq]
+    result = {
+        "date_field": date_col,
+        "metric": target,
+        "frequency": freq,
+        "group_by": group_col,
+        "model": model,
+        "horizon": horizon,
+        "version": version["version"] if version else None,
+    }
+
+    cache_key = (dataset, date_col, target, bucket, group_col, model, alpha, beta)
+    entry = cache.get(cache_key) if cache is not None and dataset else None
+    fit = "cached"
+    if entry is None or version is None or entry.version != version["version"]:
+        fitted = None
+        if entry is not None and version is not None:
+            if entry.base_version == version["base_version"] and entry.rows <= len(df):
+                with stage("forecast.update"):
+                    fitted = _update_fit(df, keys, bucket, target, group_col, entry)
+                fit = "incremental"
+        if fitted is None:
+            with stage("forecast.fit"):
+                fitted = _full_fit(df, keys, bucket, target, group_col, model, alpha, beta)
+            fit = "full"
+        if fitted is None:
+            return {**result, "fit": fit, "series": []}
+        if version is not None:
+            fitted.version = version["version"]
+            fitted.base_version = version["base_version"]
+        if cache is not None and dataset:
+            cache.put(cache_key, fitted)
+        entry = fitted
+
+    with stage("forecast.predict"):
+        model_state = copy.deepcopy(entry.model)
+        model_state.update(entry.open_block, entry.closed)
+        span = entry.closed + entry.open_block.shape[1]
+        mean, sigma = model_state.forecast(span, horizon)
+        spread = INTERVAL_Z * sigma[:, None] * np.sqrt(np.arange(1, horizon + 1))
+        n_series = mean.shape[0]
+        periods = keys.labels(bucket, entry.origin + span + np.arange(horizon))
+        frame: Dict[str, Any] = {}
+        if group_col is not None:
+            frame[group_col] = entry.groups.take(np.repeat(np.arange(n_series), horizon))
+        frame["period"] = np.tile(periods.to_numpy(), n_series)
+        frame["forecast"] = mean.ravel()
+        frame["lower"] = (mean - spread).ravel()
+        frame["upper"] = (mean + spread).ravel()
+        records = pd.DataFrame(frame).to_dict(orient="records")
+    return {**result, "fit": fit, "series": records}
+
+
+def _series_values(df: pd.DataFrame, target: str, rows: np.ndarray) -> np.ndarray:
+    values = df[target].to_numpy(dtype=np.float64, na_value=np.nan)[rows]
+    return np.where(np.isnan(values), 0.0, values)
+
+
+def _full_fit(
+    df: pd.DataFrame,
+    keys: PeriodKeys,
+    bucket: str,
+    target: str,
+    group_col: Optional[str],
+    model: str,
+    alpha: float,
+    beta: float,
+) -> Optional[FittedForecast]:
+    rows, periods, codes, groups = bucket_rows(df, keys, bucket, group_col)
+    if len(rows) == 0:
+        return None
+    n_series = len(groups) if groups is not None else 1
+    origin = int(periods.min())
+    span = int(periods.max()) - origin + 1
+    matrix = np.bincount(
+        codes * span + (periods - origin),
+        weights=_series_values(df, target, rows),
+        minlength=n_series * span,
+    ).reshape(n_series, span)
+    starts = np.full(n_series, span, dtype=np.int64)
+    np.minimum.at(starts, codes, periods - origin)
+    closed = span - 1
+    state = _new_model(model, starts, bucket, alpha, beta)
+    state.update(matrix[:, :closed], 0)
+    return FittedForecast(0, 0, len(df), groups, origin, closed, state, matrix[:, closed:])
+
+
+def _update_fit(
+    df: pd.DataFrame,
+    keys: PeriodKeys,
+    bucket: str,
+    target: str,
+    group_col: Optional[str],
+    entry: FittedForecast,
+) -> Optional[FittedForecast]:
+    if group_col is not None:
+        appended = df[group_col].iloc[entry.rows:]
+        if (appended.notna() & ~appended.isin(entry.groups)).any():
+            return None
+    rows, periods, codes, _ = bucket_rows(
+        df, keys, bucket, group_col, start_row=entry.rows, groups=entry.groups
+    )
+    offsets = periods - entry.origin
+    if len(offsets) and int(offsets.min()) < entry.closed:
+        return None
+
+    n_series, open_width = entry.open_block.shape
+    span = entry.closed + open_width
+    if len(offsets):
+        span = max(span, int(offsets.max()) + 1)
+    width = span - entry.closed
+    block = np.zeros((n_series, width))
+    block[:, :open_width] = entry.open_block
+    block += np.bincount(
+        codes * width + (offsets - entry.closed),
+        weights=_series_values(df, target, rows),
+        minlength=n_series * width,
+    ).reshape(n_series, width)
+
+    closed = span - 1
+    state = copy.deepcopy(entry.model)
+    np.minimum.at(state.starts, codes, offsets)
+    state.update(block[:, : closed - entry.closed], entry.closed)
+    return FittedForecast(
+        0,
+        0,
+        len(df),
+        entry.groups,
+        entry.origin,
+        closed,
+        state,
+        block[:, closed - entry.closed:],
+    )
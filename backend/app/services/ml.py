@@ -5,6 +5,8 @@ import pandas as pd
 from sklearn.cluster import KMeans
 from sklearn.preprocessing import StandardScaler
 
+from ..core.instrumentation import stage
+
 
 def compute_kmeans_clusters(
     df: pd.DataFrame,
@@ -35,14 +37,14 @@ def compute_kmeans_clusters(
     if len(working) > sample_size:
         working = working.sample(sample_size, random_state=42)
 
-    scaler = StandardScaler()
-    X_scaled = scaler.fit_transform(working)
-
     if n_clusters > len(working):
         n_clusters = max(1, len(working))
 
-    model = KMeans(n_clusters=n_clusters, random_state=42, n_init="auto")
-    model.fit(X_scaled)
+    with stage("clusters.fit"):
+        scaler = StandardScaler()
+        X_scaled = scaler.fit_transform(working)
+        model = KMeans(n_clusters=n_clusters, random_state=42, n_init="auto")
+        model.fit(X_scaled)
 
     centers_scaled = model.cluster_centers_
     centers = scaler.inverse_transform(centers_scaled)
@@ -0,0 +1,156 @@
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from ..core.instrumentation import stage
+from .time_buckets import PeriodKeys
+
+MANIFEST_NAME = "manifest.json"
+
+_STRING_TYPES = {
+    pa.string(): pd.StringDtype("pyarrow_numpy"),
+    pa.large_string(): pd.StringDtype("pyarrow_numpy"),
+}
+
+
+def manifest_stamp(shared_dir: Path) -> Optional[Tuple[int, int]]:
+    try:
+        info = (shared_dir / MANIFEST_NAME).stat()
+    except FileNotFoundError:
+        return None
+    return info.st_ino, info.st_mtime_ns
+
+
+def read_manifest(shared_dir: Path) -> Optional[Dict[str, Any]]:
+    try:
+        return json.loads((shared_dir / MANIFEST_NAME).read_text())
+    except FileNotFoundError:
+        return None
+
+
+def attach_dataset(
+    shared_dir: Path, entry: Dict[str, Any]
+) -> Tuple[pd.DataFrame, Dict[str, Optional[PeriodKeys]]]:
+    with stage("shared.attach"):
+        table = _read_table(shared_dir / entry["table"])
+        df = table.to_pandas(split_blocks=True, types_mapper=_STRING_TYPES.get)
+        period_keys: Dict[str, Optional[PeriodKeys]] = {}
+        for column, file_name in entry["period_keys"].items():
+            keys_table = _read_table(shared_dir / file_name)
+            arrays = {name: _column_array(keys_table, name) for name in keys_table.column_names}
+            rows = arrays.pop("rows")
+            period_keys[column] = PeriodKeys(rows, arrays)
+    return df, period_keys
+
+
+def publish_datasets(
+    manager, shared_dir: Path, fingerprints: Optional[Dict[str, str]] = None
+) -> Dict[str, Any]:
+    shared_dir.mkdir(parents=True, exist_ok=True)
+    previous = read_manifest(shared_dir) or {"generation": 0, "datasets": {}}
+    fingerprints = fingerprints or {}
+    datasets: Dict[str, Dict[str, Any]] = {}
+    for name, info in manager.list_datasets().items():
+        fingerprint = fingerprints.get(info["path"]) or _file_fingerprint(Path(info["path"]))
+        existing = previous["datasets"].get(name)
+        if existing is not None and existing["fingerprint"] == fingerprint:
+            datasets[name] = existing
+            continue
+        version = existing["version"] + 1 if existing is not None else 1
+        stem = f"{name}.v{version}"
+        with stage("shared.publish"):
+            table = _shared_table(manager.get_dataframe(name))
+            _write_table(shared_dir / f"{stem}.arrow", table)
+            key_files: Dict[str, str] = {}
+            for index, (column, keys) in enumerate(manager.get_period_keys(name).items()):
+                if keys is None:
+                    continue
+                file_name = f"{stem}.keys{index}.arrow"
+                _write_table(shared_dir / file_name, pa.table({"rows": keys.rows, **keys.keys}))
+                key_files[column] = file_name
+        datasets[name] = {
+            "name": name,
+            "path": info["path"],
+            "rows": info["rows"],
+            "columns": info["columns"],
+            "schema": info["schema"],
+            "version": version,
+            "base_version": version,
+            "fingerprint": fingerprint,
+            "table": f"{stem}.arrow",
+            "period_keys": key_files,
+        }
+    manifest = {"generation": previous["generation"] + 1, "datasets": datasets}
+    _write_atomic(shared_dir / MANIFEST_NAME, json.dumps(manifest).encode("utf-8"))
+    _prune(shared_dir, [manifest, previous])
+    return manifest
+
+
+def data_fingerprint(data_dir: Path) -> Dict[str, str]:
+    if not data_dir.exists():
+        return {}
+    return {
+        str(path): _file_fingerprint(path)
+        for path in sorted(data_dir.rglob("*"))
+        if path.is_file()
+    }
+
+
+def _file_fingerprint(path: Path) -> str:
+    info = path.stat()
+    return f"{info.st_mtime_ns}:{info.st_size}"
+
+
+def _column_array(table: pa.Table, name: str) -> np.ndarray:
+    column = table.column(name)
+    if column.num_chunks == 1:
+        return column.chunk(0).to_numpy()
+    return column.to_numpy()
+
+
+def _shared_table(df: pd.DataFrame) -> pa.Table:
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    for index, field in enumerate(table.schema):
+        if pa.types.is_string(field.type):
+            field = field.with_type(pa.large_string())
+            column = table.column(index).cast(pa.large_string())
+        elif pa.types.is_floating(field.type) and table.column(index).null_count:
+            column = pa.array(df.iloc[:, index].to_numpy(), type=field.type, from_pandas=False)
+        else:
+            continue
+        table = table.set_column(index, field, column)
+    return table
+
+
+def _read_table(path: Path) -> pa.Table:
+    return pa.ipc.open_file(pa.memory_map(str(path), "r")).read_all()
+
+
+def _write_table(path: Path, table: pa.Table) -> None:
+    temp_path = path.with_name(f".{path.name}.tmp")
+    with pa.OSFile(str(temp_path), "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(temp_path, path)
+
+
+def _write_atomic(path: Path, payload: bytes) -> None:
+    temp_path = path.with_name(f".{path.name}.tmp")
+    temp_path.write_bytes(payload)
+    os.replace(temp_path, path)
+
+
+def _prune(shared_dir: Path, manifests: List[Dict[str, Any]]) -> None:
+    keep = {MANIFEST_NAME}
+    for manifest in manifests:
+        for entry in manifest["datasets"].values():
+            keep.add(entry["table"])
+            keep.update(entry["period_keys"].values())
+    for path in shared_dir.glob("*.arrow"):
+        if path.name not in keep:
+            path.unlink()
@@ -0,0 +1,172 @@
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+FREQ_BUCKETS: Dict[str, str] = {
+    "D": "D",
+    "W": "W",
+    "W-SUN": "W",
+    "M": "M",
+    "ME": "M",
+    "Q": "Q",
+    "QE": "Q",
+    "Q-DEC": "Q",
+    "Y": "Y",
+    "YE": "Y",
+    "Y-DEC": "Y",
+    "A": "Y",
+    "A-DEC": "Y",
+}
+
+_DENSE_CELL_LIMIT = 1 << 22
+
+
+class PeriodKeys:
+    def __init__(self, rows: np.ndarray, keys: Dict[str, np.ndarray]) -> None:
+        self.rows = rows
+        self.keys = keys
+
+    @classmethod
+    def from_dates(cls, dates: pd.Series, offset: int = 0) -> "PeriodKeys":
+        mask = dates.notna().to_numpy()
+        values = dates.to_numpy()[mask]
+        days = values.astype("datetime64[D]").astype(np.int64)
+        months = values.astype("datetime64[M]").astype(np.int64)
+        keys = {
+            "D": days.astype(np.int32),
+            "W": ((days + 3) // 7).astype(np.int32),
+            "M": months.astype(np.int32),
+            "Q": (months // 3).astype(np.int32),
+            "Y": (months // 12).astype(np.int32),
+        }
+        return cls(np.flatnonzero(mask) + offset, keys)
+
+    def extend(self, dates: pd.Series, offset: int) -> "PeriodKeys":
+        other = PeriodKeys.from_dates(dates, offset)
+        keys = {
+            bucket: np.concatenate([self.keys[bucket], other.keys[bucket]])
+            for bucket in self.keys
+        }
+        return PeriodKeys(np.concatenate([self.rows, other.rows]), keys)
+
+    def labels(self, bucket: str, keys: np.ndarray) -> pd.DatetimeIndex:
+        if bucket == "D":
+            days = keys
+        elif bucket == "W":
+            days = keys * 7 + 3
+        else:
+            if bucket == "Q":
+                months = keys * 3 + 2
+            elif bucket == "Y":
+                months = keys * 12 + 11
+            else:
+                months = keys
+            next_month = (months + 1).astype("datetime64[M]").astype("datetime64[D]")
+            days = next_month.astype(np.int64) - 1
+        return pd.DatetimeIndex(days.astype("datetime64[D]").astype("datetime64[ns]"))
+
+
+def build_period_keys(dates: pd.Series) -> Optional[PeriodKeys]:
+    if not pd.api.types.is_datetime64_dtype(dates):
+        return None
+    return PeriodKeys.from_dates(dates)
+
+
+def supports_bucketing(df: pd.DataFrame, value_cols: List[str], freq: str) -> bool:
+    if freq not in FREQ_BUCKETS:
+        return False
+    return all(
+        pd.api.types.is_numeric_dtype(df[col]) or pd.api.types.is_bool_dtype(df[col])
+        for col in value_cols
+    )
+
+
+def bucket_rows(
+    df: pd.DataFrame,
+    keys: PeriodKeys,
+    bucket: str,
+    group_by: Optional[str] = None,
+    start_row: int = 0,
+    groups: Optional[pd.Index] = None,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, Optional[pd.Index]]:
+    first = int(np.searchsorted(keys.rows, start_row))
+    last = int(np.searchsorted(keys.rows, len(df)))
+    rows = keys.rows[first:last]
+    periods = keys.keys[bucket][first:last].astype(np.int64)
+    if group_by is None:
+        return rows, periods, np.zeros(len(rows), dtype=np.int64), None
+
+    column = df[group_by]
+    if groups is None:
+        codes, groups = pd.factorize(column, sort=True)
+        codes = codes[rows]
+    else:
+        codes = groups.get_indexer(column.iloc[rows])
+    codes = codes.astype(np.int64)
+    keep = codes >= 0
+    if not keep.all():
+        rows = rows[keep]
+        periods = periods[keep]
+        codes = codes[keep]
+    return rows, periods, codes, groups
+
+
+def aggregate_periods(
+    df: pd.DataFrame,
+    keys: PeriodKeys,
+    freq: str,
+    value_cols: List[str],
+    group_by: Optional[str] = None,
+) -> pd.DataFrame:
+    bucket = FREQ_BUCKETS[freq]
+    rows, periods, group_codes, group_values = bucket_rows(df, keys, bucket, group_by)
+    values = {
+        col: df[col].to_numpy(dtype=np.float64, na_value=np.nan)[rows]
+        for col in value_cols
+    }
+
+    columns = ([group_by] if group_by is not None else []) + ["period"] + value_cols
+    if len(periods) == 0:
+        return pd.DataFrame(columns=columns)
+
+    origin = int(periods.min())
+    span = int(periods.max()) - origin + 1
+    cell = group_codes * span + (periods - origin)
+    n_cells = (int(group_codes.max()) + 1) * span
+    if n_cells <= _DENSE_CELL_LIMIT:
+        counts = np.bincount(cell, minlength=n_cells)
+        cells = np.flatnonzero(counts)
+        lookup = np.zeros(n_cells, dtype=np.int64)
+        lookup[cells] = np.arange(len(cells))
+        inverse = lookup[cell]
+    else:
+        cells, inverse = np.unique(cell, return_inverse=True)
+
+    cell_group = cells // span
+    cell_period = cells % span
+    starts = np.flatnonzero(np.r_[True, cell_group[1:] != cell_group[:-1]])
+    ends = np.r_[starts[1:], len(cells)] - 1
+    first = cell_period[starts]
+    lengths = cell_period[ends] - first + 1
+    offsets = np.r_[0, np.cumsum(lengths)[:-1]]
+    total = int(lengths.sum())
+    ordinal = np.repeat(np.arange(len(starts)), ends - starts + 1)
+    positions = offsets[ordinal] + cell_period - first[ordinal]
+    out_period = np.repeat(first - offsets, lengths) + np.arange(total)
+
+    result: Dict[str, object] = {}
+    if group_by is not None:
+        result[group_by] = group_values.take(np.repeat(cell_group[starts], lengths))
+    result["period"] = keys.labels(bucket, out_period + origin)
+    for col, arr in values.items():
+        weights = np.where(np.isnan(arr), 0.0, arr)
+        sums = np.bincount(inverse, weights=weights, minlength=len(cells))
+        filled = np.zeros(total, dtype=np.float64)
+        filled[positions] = sums
+        dtype = df[col].dtype
+        if pd.api.types.is_integer_dtype(dtype) or pd.api.types.is_bool_dtype(dtype):
+            result[col] = filled.astype(np.int64)
+        else:
+            result[col] = filled
+    return pd.DataFrame(result)
@@ -14,16 +14,32 @@ import {
   SummaryResponse,
   TrendsResponse,
   QualityResponse,
-  fetchAnomalies,
-  fetchClusters,
-  fetchGroupBy,
-  fetchSummary,
-  fetchTrends,
-  fetchQuality,
+  BatchQuery,
+  fetchBatch,
 } from "../services/api";
 
 type LoadingState = "idle" | "loading" | "error";
 
+type BatchEntry = {
+  query: BatchQuery;
+  onResult: (dataset: string, result: any) => void;
+  setState: (state: LoadingState) => void;
+};
+
+function runBatch(dataset: string, entries: BatchEntry[]) {
+  entries.forEach((entry) => entry.setState("loading"));
+  fetchBatch({ dataset, queries: entries.map((entry) => entry.query) })
+    .then((response) => {
+      response.data.results.forEach((item, index) => {
+        entries[index].onResult(response.data.dataset, item.result);
+        entries[index].setState("idle");
+      });
+    })
+    .catch(() => {
+      entries.forEach((entry) => entry.setState("error"));
+    });
+}
+
 const Dashboard: React.FC = () => {
   const {
     datasets,
@@ -108,172 +124,102 @@ const Dashboard: React.FC = () => {
     if (!selectedDataset) {
       return;
     }
-
-    setSummaryState("loading");
-    fetchSummary({
-      dataset: selectedDataset.name,
-      metrics: selectedMetric ? [selectedMetric] : undefined,
-      group_by: selectedGroupBy ? [selectedGroupBy] : undefined,
-    })
-      .then((response) => {
-        setSummary(response.data);
-        setSummaryState("idle");
-      })
-      .catch(() => {
-        setSummaryState("error");
+    const metrics = selectedMetric ? [selectedMetric] : undefined;
+    const overviewGroup =
+      selectedDataset.categorical_fields[0] ||
+      selectedDataset.datetime_fields[0] ||
+      null;
+    const entries: BatchEntry[] = [
+      {
+        query: {
+          type: "summary",
+          metrics,
+          group_by: selectedGroupBy ? [selectedGroupBy] : undefined,
+        },
+        onResult: (dataset, result) => setSummary({ dataset, result }),
+        setState: setSummaryState,
+      },
+      {
+        query: { type: "summary", metrics },
+        onResult: (dataset, result) => setSummaryOverall({ dataset, result }),
+        setState: setSummaryOverallState,
+      },
+      {
+        query: {
+          type: "anomalies",
+          metric: selectedMetric || undefined,
+          group_by: selectedGroupBy || undefined,
+          method: "iqr",
+        },
+        onResult: (dataset, result) => setAnomalies({ dataset, result }),
+        setState: setAnomalyState,
+      },
+    ];
+    if (selectedDateField) {
+      entries.push({
+        query: {
+          type: "trends",
+          date_field: selectedDateField,
+          metric: selectedMetric || undefined,
+          freq: "M",
+          group_by: selectedGroupBy || undefined,
+        },
+        onResult: (dataset, result) => setTrends({ dataset, result }),
+        setState: setTrendsState,
       });
-  }, [selectedDataset, selectedMetric, selectedGroupBy]);
-
-  useEffect(() => {
-    if (!selectedDataset) {
-      return;
-    }
-    if (!selectedDateField) {
+    } else {
       setTrends(null);
-      return;
     }
-    setTrendsState("loading");
-    fetchTrends({
-      dataset: selectedDataset.name,
-      date_field: selectedDateField || undefined,
-      metric: selectedMetric || undefined,
-      freq: "M",
-      group_by: selectedGroupBy || undefined,
-    })
-      .then((response) => {
-        setTrends(response.data);
-        setTrendsState("idle");
-      })
-      .catch(() => {
-        setTrendsState("error");
+    if (selectedGroupBy) {
+      entries.push({
+        query: {
+          type: "groupby",
+          dimensions: [selectedGroupBy],
+          metrics,
+          agg: "sum",
+        },
+        onResult: (dataset, result) => setGroupByResult({ dataset, result }),
+        setState: setGroupByState,
       });
-  }, [selectedDataset, selectedMetric, selectedGroupBy, selectedDateField]);
-
-  useEffect(() => {
-    if (!selectedDataset) {
-      return;
-    }
-    if (!selectedGroupBy) {
+    } else {
       setGroupByResult(null);
-      return;
     }
-    setGroupByState("loading");
-    fetchGroupBy({
-      dataset: selectedDataset.name,
-      dimensions: [selectedGroupBy],
-      metrics: selectedMetric ? [selectedMetric] : undefined,
-      agg: "sum",
-    })
-      .then((response) => {
-        setGroupByResult(response.data);
-        setGroupByState("idle");
-      })
-      .catch(() => {
-        setGroupByState("error");
-      });
-  }, [selectedDataset, selectedMetric, selectedGroupBy]);
-
-  useEffect(() => {
-    if (!selectedDataset) {
-      return;
-    }
-    setAnomalyState("loading");
-    fetchAnomalies({
-      dataset: selectedDataset.name,
-      metric: selectedMetric || undefined,
-      group_by: selectedGroupBy || undefined,
-      method: "iqr",
-    })
-      .then((response) => {
-        setAnomalies(response.data);
-        setAnomalyState("idle");
-      })
-      .catch(() => {
-        setAnomalyState("error");
+    if (overviewGroup) {
+      entries.push({
+        query: {
+          type: "groupby",
+          dimensions: [overviewGroup],
+          metrics,
+          agg: "sum",
+        },
+        onResult: (_dataset, result) =>
+          setOverviewGroupData(result.result || []),
+        setState: setOverviewGroupState,
       });
-  }, [selectedDataset, selectedMetric, selectedGroupBy]);
-
-  useEffect(() => {
-    if (!selectedDataset) {
-      return;
+    } else {
+      setOverviewGroupData([]);
     }
-    setClusterState("loading");
-    fetchClusters({
-      dataset: selectedDataset.name,
-      n_clusters: 4,
-    })
-      .then((response) => {
-        setClusters(response.data);
-        setClusterState("idle");
-      })
-      .catch(() => {
-        setClusterState("error");
-      });
-  }, [selectedDataset]);
+    runBatch(selectedDataset.name, entries);
+  }, [selectedDataset, selectedMetric, selectedGroupBy, selectedDateField]);
 
   useEffect(() => {
     if (!selectedDataset) {
       return;
     }
-    setQualityState("loading");
-    fetchQuality({
-      dataset: selectedDataset.name,
-    })
-      .then((response) => {
-        setQuality(response.data);
-        setQualityState("idle");
-      })
-      .catch(() => {
-        setQualityState("error");
-      });
+    runBatch(selectedDataset.name, [
+      {
+        query: { type: "clusters", n_clusters: 4 },
+        onResult: (dataset, result) => setClusters({ dataset, result }),
+        setState: setClusterState,
+      },
+      {
+        query: { type: "quality" },
+        onResult: (dataset, result) => setQuality({ dataset, result }),
+        setState: setQualityState,
+      },
+    ]);
   }, [selectedDataset]);
 
-  useEffect(() => {
-    if (!selectedDataset) {
-      return;
-    }
-    setSummaryOverallState("loading");
-    fetchSummary({
-      dataset: selectedDataset.name,
-      metrics: selectedMetric ? [selectedMetric] : undefined,
-    })
-      .then((response) => {
-        setSummaryOverall(response.data);
-        setSummaryOverallState("idle");
-      })
-      .catch(() => {
-        setSummaryOverallState("error");
-      });
-  }, [selectedDataset, selectedMetric]);
-
-  useEffect(() => {
-    if (!selectedDataset) {
-      return;
-    }
-    const defaultGroup =
-      selectedDataset.categorical_fields[0] ||
-      selectedDataset.datetime_fields[0] ||
-      null;
-    if (!defaultGroup) {
-      setOverviewGroupData([]);
-      return;
-    }
-    setOverviewGroupState("loading");
-    fetchGroupBy({
-      dataset: selectedDataset.name,
-      dimensions: [defaultGroup],
-      metrics: selectedMetric ? [selectedMetric] : undefined,
-      agg: "sum",
-    })
-      .then((response) => {
-        setOverviewGroupData(response.data.result.result || []);
-        setOverviewGroupState("idle");
-      })
-      .catch(() => {
-        setOverviewGroupState("error");
-      });
-  }, [selectedDataset, selectedMetric]);
-
   const totalRecords = selectedDataset ? selectedDataset.rows : 0;
   const numericFieldCount = selectedDataset
     ? selectedDataset.numeric_fields.length
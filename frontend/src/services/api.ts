@@ -20,6 +20,7 @@ export interface DatasetSchema {
   categorical_fields: string[];
   datetime_fields: string[];
   primary_date_field?: string | null;
+  version: number;
   schema: ColumnSchema[];
 }
 
@@ -100,6 +101,56 @@ export interface QualityResponse {
   };
 }
 
+export interface ForecastResponse {
+  dataset: string;
+  result: {
+    date_field: string | null;
+    metric?: string;
+    frequency?: string;
+    group_by?: string | null;
+    model?: string;
+    horizon?: number;
+    version?: number | null;
+    fit?: "full" | "incremental" | "cached";
+    series: {
+      period: string;
+      forecast: number;
+      lower: number;
+      upper: number;
+      [group: string]: any;
+    }[];
+  };
+}
+
+export type BatchQueryType =
+  | "summary"
+  | "trends"
+  | "groupby"
+  | "anomalies"
+  | "quality"
+  | "clusters";
+
+export interface BatchQuery {
+  type: BatchQueryType;
+  metrics?: string[];
+  metric?: string;
+  dimensions?: string[];
+  group_by?: string | string[];
+  date_field?: string;
+  freq?: string;
+  agg?: string;
+  method?: string;
+  n_clusters?: number;
+}
+
+export interface BatchResponse {
+  dataset: string;
+  results: {
+    type: BatchQueryType;
+    result: any;
+  }[];
+}
+
 export function fetchSchema() {
   return api.get<SchemaResponse>("/schema");
 }
@@ -150,3 +201,21 @@ export function fetchClusters(params: {
 export function fetchQuality(params: { dataset: string }) {
   return api.get<QualityResponse>("/quality", { params });
 }
+
+export function fetchBatch(body: { dataset: string; queries: BatchQuery[] }) {
+  return api.post<BatchResponse>("/batch", body);
+}
+
+export function fetchForecast(params: {
+  dataset: string;
+  date_field?: string;
+  metric?: string;
+  freq?: string;
+  group_by?: string;
+  horizon?: number;
+  model?: "holt" | "linear" | "seasonal_naive";
+  alpha?: number;
+  beta?: number;
+}) {
+  return api.get<ForecastResponse>("/forecast", { params });
+}